@@ -2,70 +2,342 @@
 Standalone TenderAI application using Flask with inline templates.
 This app allows uploading tender documents (PDF, DOCX, XLSX), extracts
 basic information such as EMD, due date, a short summary, and displays
-them on a simple dashboard. It stores data in a JSON file and saves
+them on a simple dashboard. It stores data in an NDJSON file and saves
 uploaded files into an 'uploads' directory. HTML and CSS are embedded
-directly in the Python file via render_template_string to avoid
+directly in the Python file and compiled once at import time to avoid
 external template files.
 """
 
-from flask import Flask, request, redirect, url_for, flash, render_template_string, send_from_directory
+from flask import Flask, Response, request, redirect, url_for, flash, send_from_directory
 import os
+import atexit
 import uuid
+import hashlib
 import subprocess
 import zipfile
 import re
 import json
+import threading
+import queue
+import signal
+import time
 from datetime import datetime
+from operator import itemgetter
+from markupsafe import escape
 from openpyxl import load_workbook
 
+try:
+    from lxml import etree
+except ImportError:  # optional; DOCX text falls back to regex tag stripping
+    etree = None
+
+try:
+    import orjson
+except ImportError:  # optional; the stdlib json module is used instead
+    orjson = None
+
 app = Flask(__name__)
 app.secret_key = "secret-key"
 
 # Directory configuration
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 UPLOAD_DIR = os.path.join(BASE_DIR, "uploads")
-DATA_FILE = os.path.join(BASE_DIR, "tenders.json")
+DATA_FILE = os.path.join(BASE_DIR, "tenders.ndjson")
+LEGACY_DATA_FILE = os.path.join(BASE_DIR, "tenders.json")
+
+# Number of background threads extracting uploaded files
+MAX_WORKERS = 8
+
+# Seconds the writer thread waits to batch tender updates into one append
+SAVE_DELAY = 0.5
 
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
-# Load existing tenders from disk if present
+# Regex patterns used on every upload, compiled once at import time.
+# These stay four separate searches: each stops at its first hit, and folding
+# them into one alternation made number-heavy text about twice as slow.
+EMD_RE = re.compile(r'(?:EMD|Earnest Money Deposit).*?(₹|Rs\.?|INR)\s*([\d,\.]+)', re.IGNORECASE)
+MONEY_RE = re.compile(r'(₹|Rs\.?|INR)\s*([\d,\.]+)')
+DATE_LABELED_RE = re.compile(r'(?:submission(?: date)?|due date|closing date)[^\d]*(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})', re.IGNORECASE)
+DATE_GENERIC_RE = re.compile(r'\d{1,2}[/-]\d{1,2}[/-]\d{2,4}')
+SENT_SPLIT_RE = re.compile(r'(?<=[.!?])\s+')
+XML_TAG_RE = re.compile(r'<[^>]+>')
+
+# WordprocessingML text run element, the only DOCX node holding document text,
+# and the paragraph element, used to drop parsed content as iterparse goes
+W_TEXT_TAG = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}t'
+W_PARA_TAG = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}p'
+
+# EMD and due date labels sit in the first pages; only scan this many characters
+SCAN_WINDOW = 200_000
+
+# Characters of extracted text shown on the detail page and per text chunk
+TEXT_CHUNK_CHARS = 50_000
+
+# Spreadsheet rows kept per XLSX upload: the detail page preview size
+TABLE_PREVIEW_ROWS = 10
+
+# pdftotext limits: pages read per PDF and seconds before it is killed
+PDF_MAX_PAGES = int(os.environ.get('PDF_MAX_PAGES', 20))
+PDF_TIMEOUT = int(os.environ.get('PDF_TIMEOUT', 30))
+
+
+def json_dumps(obj) -> bytes:
+    """Serialize obj to compact UTF-8 JSON, using orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+
+# Both parsers accept bytes
+json_loads = orjson.loads if orjson is not None else json.loads
+
+
+def load_tenders() -> tuple:
+    """Load tender data from the NDJSON log, one tender per line.
+    A later line for the same id replaces the earlier one. A line that
+    cannot be parsed (e.g. torn by a crash mid-append) is skipped.
+    Returns (tenders, stale) where stale counts superseded or bad lines.
+    """
+    loaded = {}
+    lines = 0
+    with open(DATA_FILE, 'rb') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            lines += 1
+            try:
+                tender = json_loads(line)
+            except ValueError as e:
+                print(f"Skipping unreadable line in {DATA_FILE}: {e}")
+                continue
+            loaded[tender['id']] = tender
+    return loaded, lines - len(loaded)
+
+
+def rewrite_tenders() -> None:
+    """Rewrite the NDJSON log with one line per current tender.
+    The data is written to a temporary sibling and moved into place with
+    os.replace, so a crash never leaves a truncated log behind.
+    """
+    tmp_path = DATA_FILE + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(b''.join(json_dumps(tender) + b'\n' for tender in tenders.values()))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, DATA_FILE)
+
+
+def save_tenders(batch) -> None:
+    """Append the given tenders to the NDJSON log.
+    Only new or changed tenders are written, never the whole map.
+    Callers must hold _write_lock; see flush_tenders. If the append fails,
+    the file is cut back to its old length so a retry does not follow a
+    torn line.
+    """
+    data = b''.join(json_dumps(tender) + b'\n' for tender in batch)
+    with open(DATA_FILE, 'ab') as f:
+        start = f.tell()
+        try:
+            f.write(data)
+            f.flush()
+        except OSError:
+            f.truncate(start)
+            raise
+
+
+# Load existing tenders from disk if present, migrating the old JSON file.
+# The log is compacted on startup when it holds superseded or torn lines.
 if os.path.exists(DATA_FILE):
-    with open(DATA_FILE, 'r', encoding='utf-8') as f:
-        tenders = json.load(f)
+    tenders, stale = load_tenders()
+    needs_rewrite = stale > 0
+elif os.path.exists(LEGACY_DATA_FILE):
+    with open(LEGACY_DATA_FILE, 'rb') as f:
+        tenders = json_loads(f.read())
+    needs_rewrite = True
 else:
     tenders = {}
+    needs_rewrite = False
+
+# Tenders from the tenders.json era carry their text inline; move it out to
+# <path>.txt so the data file only holds the path
+for _tender in tenders.values():
+    if 'text' in _tender:
+        try:
+            with open(_tender['path'] + '.txt', 'w', encoding='utf-8') as f:
+                f.write(_tender['text'])
+        except OSError as e:
+            print(f"Keeping inline text for {_tender['path']}: {e}")
+            continue
+        _tender['text_path'] = _tender['path'] + '.txt'
+        del _tender['text']
+        needs_rewrite = True
+
+if needs_rewrite:
+    rewrite_tenders()
+
+# Tenders saved before uploaded_at_ts existed get it from the ISO string
+for _tender in tenders.values():
+    if 'uploaded_at_ts' not in _tender:
+        _tender['uploaded_at_ts'] = datetime.fromisoformat(_tender['uploaded_at']).timestamp()
+
+# Guards tenders and the caches below; requests and workers run in threads
+tenders_lock = threading.Lock()
+
+# Dashboard rows, rebuilt only when 'version' moves past 'built_version'.
+# Every change to tenders bumps the counter, which is enough to invalidate it.
+_index_cache = {'version': 0, 'built_version': -1, 'rows_html': ''}
+
+
+def dedup_key(tender: dict) -> str:
+    """Key identifying uploads whose extraction results are interchangeable:
+    the content digest plus the extension, which picks the extractor.
+    """
+    return tender['digest'] + ':' + tender['filename'].lower().split('.')[-1]
+
+
+def is_reusable(tender: dict) -> bool:
+    """Whether a tender's results may stand in for a re-upload of the same
+    file. Extractors swallow their errors and return nothing (missing
+    pdftotext, a timeout, a corrupt file), so an empty result is treated as
+    a failure that the next copy should retry.
+    """
+    return tender.get('status', 'done') == 'done' and bool(
+        tender['eligibility'] or tender['table_rows'])
 
 
-def save_tenders() -> None:
-    """Persist tender data to disk in JSON format."""
-    with open(DATA_FILE, 'w', encoding='utf-8') as f:
-        json.dump(tenders, f, ensure_ascii=False, indent=2)
+# Dedup key -> id of the first tender with that content, reusable or still
+# processing, used to skip extraction for re-uploads; guarded by tenders_lock
+_hash_index = {}
+for _tender in tenders.values():
+    if 'digest' in _tender and is_reusable(_tender):
+        _hash_index.setdefault(dedup_key(_tender), _tender['id'])
+
+# Id of a tender still processing -> duplicate uploads waiting for its
+# results; guarded by tenders_lock
+_waiting_duplicates = {}
+
+# Tenders waiting to be appended by the writer thread; guarded by tenders_lock
+_pending_writes = []
+_dirty = threading.Event()
+# Serializes appends between the writer thread and the flush at exit
+_write_lock = threading.Lock()
+
+
+def schedule_save(batch) -> None:
+    """Queue tenders for the writer thread instead of writing them inline.
+    Callers must hold tenders_lock.
+    """
+    _pending_writes.extend(batch)
+    _dirty.set()
+
+
+def flush_tenders() -> None:
+    """Append every queued tender to the data file.
+    If the write fails the batch goes back to the front of the queue, ahead
+    of anything queued meanwhile, and the error is raised.
+    """
+    with _write_lock:
+        with tenders_lock:
+            batch = _pending_writes[:]
+            del _pending_writes[:]
+        if not batch:
+            return
+        try:
+            save_tenders(batch)
+        except Exception:
+            with tenders_lock:
+                _pending_writes[:0] = batch
+            raise
+
+
+def persist_writer() -> None:
+    """Wait for queued tenders, let more arrive for SAVE_DELAY seconds,
+    then write them all in one append. A failed write is logged and
+    retried on the next round instead of stopping the thread.
+    """
+    while True:
+        _dirty.wait()
+        time.sleep(SAVE_DELAY)
+        _dirty.clear()
+        try:
+            flush_tenders()
+        except Exception as e:
+            print(f"Saving tenders to {DATA_FILE} failed, will retry: {e}")
+            _dirty.set()
+
+
+def exit_on_sigterm(signum, frame) -> None:
+    """Turn SIGTERM into a normal exit so atexit handlers, including
+    flush_tenders, still run. Python's default SIGTERM handling skips them.
+    """
+    raise SystemExit(0)
+
+
+threading.Thread(target=persist_writer, daemon=True).start()
+atexit.register(flush_tenders)
 
 
 def extract_text_from_pdf(path: str) -> str:
     """Extract text from a PDF file using the pdftotext command-line tool.
+    pdftotext writes to the sibling <path>.txt rather than a pipe, so the
+    output is read back in one go instead of being buffered by Python; the
+    file is left in place as the tender's text file.
+    Only the first PDF_MAX_PAGES pages are read; if pdftotext runs longer
+    than PDF_TIMEOUT seconds it is killed and whatever it wrote is kept.
     Returns an empty string if extraction fails.
     """
+    txt_path = path + '.txt'
     try:
-        result = subprocess.run(
-            ['pdftotext', '-layout', path, '-'],
-            stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True
-        )
-        return result.stdout.decode('utf-8', errors='ignore')
+        try:
+            subprocess.run(
+                ['pdftotext', '-layout', '-l', str(PDF_MAX_PAGES), path, txt_path],
+                stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, check=True,
+                timeout=PDF_TIMEOUT
+            )
+        except subprocess.TimeoutExpired:
+            print(f"PDF extraction timed out for {path}; keeping partial text")
+        with open(txt_path, 'rb') as f:
+            return f.read().decode('utf-8', errors='ignore')
     except Exception as e:
         print(f"PDF extraction failed for {path}: {e}")
+        if os.path.exists(txt_path):
+            os.remove(txt_path)
         return ""
 
 
 def extract_text_from_docx(path: str) -> str:
     """Extract text from a DOCX file by reading its XML content.
+    With lxml available the XML is streamed and only w:t text is kept;
+    otherwise all tags are stripped with a regex.
     Returns an empty string if extraction fails.
     """
     try:
         with zipfile.ZipFile(path) as docx_zip:
             with docx_zip.open('word/document.xml') as document_xml:
-                xml = document_xml.read().decode('utf-8', errors='ignore')
-                cleaned = re.sub(r'<[^>]+>', '', xml)
+                if etree is not None:
+                    parts = []
+                    # Never expand entities from uploaded XML (external entities
+                    # would pull server files into the tender text)
+                    events = etree.iterparse(document_xml, events=('end',),
+                                             tag=(W_TEXT_TAG, W_PARA_TAG),
+                                             resolve_entities=False)
+                    for _, elem in events:
+                        if elem.tag == W_TEXT_TAG:
+                            if elem.text:
+                                parts.append(elem.text)
+                            # Unexpanded entity references are children; keep the text after them
+                            parts.extend(child.tail for child in elem if child.tail)
+                        else:
+                            # The paragraph's text is collected; drop it and everything
+                            # parsed before it so the tree never holds the whole body
+                            elem.clear()
+                            while elem.getprevious() is not None:
+                                del elem.getparent()[0]
+                    cleaned = ''.join(parts)
+                else:
+                    xml = document_xml.read().decode('utf-8', errors='ignore')
+                    cleaned = XML_TAG_RE.sub('', xml)
         return cleaned
     except Exception as e:
         print(f"DOCX extraction failed for {path}: {e}")
@@ -73,15 +345,21 @@ def extract_text_from_docx(path: str) -> str:
 
 
 def parse_xlsx(path: str):
-    """Parse an XLSX file and return a list of rows from the first sheet.
+    """Parse an XLSX file and return the first TABLE_PREVIEW_ROWS rows of
+    the first sheet, which is all the app ever shows or summarises.
     Each cell is converted to a string; empty cells become empty strings.
+    The workbook is opened read-only so openpyxl streams the sheet XML
+    and stops reading once the row limit is reached.
     """
     rows = []
     try:
-        wb = load_workbook(filename=path, data_only=True)
-        sheet = wb.active
-        for row in sheet.iter_rows(values_only=True):
-            rows.append([str(cell) if cell is not None else '' for cell in row])
+        wb = load_workbook(filename=path, data_only=True, read_only=True)
+        try:
+            for row in wb.active.iter_rows(max_row=TABLE_PREVIEW_ROWS, values_only=True):
+                rows.append(['' if cell is None else str(cell) for cell in row])
+        finally:
+            # Read-only workbooks keep the file handle open until closed
+            wb.close()
     except Exception as e:
         print(f"XLSX parsing failed for {path}: {e}")
     return rows
@@ -89,40 +367,133 @@ def parse_xlsx(path: str):
 
 def simple_summary(text: str) -> str:
     """Generate a simple summary by taking the first three sentences."""
-    sentences = re.split(r'(?<=[.!?])\s+', text.strip())
+    sentences = SENT_SPLIT_RE.split(text.strip())
     return ' '.join(sentences[:3])
 
 
-def extract_fields(text: str) -> dict:
-    """Extract basic fields like EMD and due date using regex heuristics.
-    If not found, fallback patterns are used. Eligibility is taken from the
-    beginning of the text.
-    """
+def _match_fields(text: str) -> dict:
+    """Run the EMD and due date patterns over text, returning '' for misses."""
     fields = {}
-    emd_match = re.search(r'(?:EMD|Earnest Money Deposit).*?(₹|Rs\.?|INR)\s*([\d,\.]+)', text, re.IGNORECASE)
+    emd_match = EMD_RE.search(text)
     if emd_match:
         fields['emd'] = f"{emd_match.group(1)} {emd_match.group(2)}"
     else:
-        general_match = re.search(r'(₹|Rs\.?|INR)\s*([\d,\.]+)', text)
+        general_match = MONEY_RE.search(text)
         fields['emd'] = f"{general_match.group(1)} {general_match.group(2)}" if general_match else ''
-    date_match = re.search(r'(?:submission(?: date)?|due date|closing date)[^\d]*(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})', text, re.IGNORECASE)
+    date_match = DATE_LABELED_RE.search(text)
     if date_match:
         fields['due_date'] = date_match.group(1)
     else:
-        generic_date = re.search(r'\d{1,2}[/-]\d{1,2}[/-]\d{2,4}', text)
+        generic_date = DATE_GENERIC_RE.search(text)
         fields['due_date'] = generic_date.group(0) if generic_date else ''
+    return fields
+
+
+def extract_fields(text: str) -> dict:
+    """Extract basic fields like EMD and due date using regex heuristics.
+    If not found, fallback patterns are used. Eligibility is taken from the
+    beginning of the text.
+    Only the first SCAN_WINDOW characters are searched; the full text is
+    rescanned only when nothing was found in that window.
+    """
+    fields = _match_fields(text[:SCAN_WINDOW])
+    if len(text) > SCAN_WINDOW and not (fields['emd'] and fields['due_date']):
+        full = _match_fields(text)
+        fields['emd'] = fields['emd'] or full['emd']
+        fields['due_date'] = fields['due_date'] or full['due_date']
     # Eligibility excerpt: first 200 characters
     fields['eligibility'] = text[:200] + '...' if len(text) > 200 else text
     return fields
 
 
-def process_file(file_storage) -> dict:
-    """Process an uploaded file and return a tender data dictionary."""
+def read_tender_text(tender: dict, offset: int = 0, limit: int = -1) -> str:
+    """Read up to limit characters of a tender's extracted text from disk,
+    starting at offset; a negative limit reads to the end.
+    Tenders saved before the text moved out of the data file keep it inline.
+    """
+    if 'text_path' not in tender:
+        text = tender.get('text', '')
+        return text[offset:] if limit < 0 else text[offset:offset + limit]
+    try:
+        with open(tender['text_path'], 'r', encoding='utf-8', errors='ignore') as f:
+            f.read(offset)
+            return f.read(limit)
+    except OSError as e:
+        print(f"Reading text failed for {tender['text_path']}: {e}")
+        return ''
+
+
+def iter_tender_text(tender: dict, offset: int = 0):
+    """Yield a tender's extracted text from offset to the end in chunks of
+    TEXT_CHUNK_CHARS characters.
+    """
+    if 'text_path' not in tender:
+        yield tender.get('text', '')[offset:]
+        return
+    try:
+        with open(tender['text_path'], 'r', encoding='utf-8', errors='ignore') as f:
+            f.read(offset)
+            for chunk in iter(lambda: f.read(TEXT_CHUNK_CHARS), ''):
+                yield chunk
+    except OSError as e:
+        print(f"Reading text failed for {tender['text_path']}: {e}")
+
+
+def save_upload(file_storage) -> dict:
+    """Save an uploaded file to the uploads directory.
+    Returns a placeholder tender marked 'processing' for process_file,
+    carrying the BLAKE2b digest of the file content.
+    """
     filename = file_storage.filename
     file_id = str(uuid.uuid4())
     save_path = os.path.join(UPLOAD_DIR, file_id + '_' + filename)
-    file_storage.save(save_path)
+    # Hash the content while writing it so duplicates can skip extraction
+    digest = hashlib.blake2b(digest_size=16)
+    with open(save_path, 'wb') as f:
+        for chunk in iter(lambda: file_storage.stream.read(65536), b''):
+            digest.update(chunk)
+            f.write(chunk)
+    now = datetime.now()
+    return {
+        'id': file_id,
+        'filename': filename,
+        'path': save_path,
+        'digest': digest.hexdigest(),
+        'table_rows': [],
+        'summary': '',
+        'emd': '',
+        'due_date': '',
+        'eligibility': '',
+        'uploaded_at': now.isoformat(),
+        # Numeric copy of uploaded_at, used as the dashboard sort key
+        'uploaded_at_ts': now.timestamp(),
+        'status': 'processing'
+    }
+
+
+def alias_tender(original: dict, pending: dict) -> dict:
+    """Return a completed tender for a duplicate upload that reuses the
+    extraction results of original. The duplicate file is replaced with a
+    symlink to the original where the platform allows it.
+    """
+    tender = dict(original)
+    for key in ('id', 'filename', 'path', 'digest', 'uploaded_at', 'uploaded_at_ts'):
+        tender[key] = pending[key]
+    link_path = pending['path'] + '.link'
+    try:
+        os.symlink(original['path'], link_path)
+        os.replace(link_path, pending['path'])
+    except OSError as e:
+        print(f"Keeping duplicate copy of {original['path']}: {e}")
+    return tender
+
 
+def process_file(pending: dict) -> dict:
+    """Process a saved upload and return the completed tender dictionary.
+    Does not touch the global tenders map, so it is safe to run in a worker thread.
+    """
+    filename = pending['filename']
+    save_path = pending['path']
     ext = filename.lower().split('.')[-1]
     text = ''
     table_rows = []
@@ -136,27 +507,97 @@ def process_file(file_storage) -> dict:
     if not text and table_rows:
         flat = '\n'.join([', '.join(row) for row in table_rows[:5]])
         text = flat
+    # Keep the full text next to the upload; only its path goes into the data file.
+    # pdftotext has already written it there for PDFs that extracted.
+    text_path = save_path + '.txt'
+    if not os.path.exists(text_path):
+        with open(text_path, 'w', encoding='utf-8') as f:
+            f.write(text)
     summary = simple_summary(text) if text else ''
     fields = extract_fields(text) if text else {'emd': '', 'due_date': '', 'eligibility': ''}
-    tender = {
-        'id': file_id,
-        'filename': filename,
-        'path': save_path,
-        'text': text,
+    tender = dict(pending)
+    tender.update({
+        'text_path': text_path,
         'table_rows': table_rows,
         'summary': summary,
         'emd': fields.get('emd', ''),
         'due_date': fields.get('due_date', ''),
         'eligibility': fields.get('eligibility', ''),
-        'uploaded_at': datetime.now().isoformat()
-    }
-    tenders[file_id] = tender
-    save_tenders()
+        'status': 'done'
+    })
     return tender
 
 
+# Uploads waiting for extraction; upload() enqueues and returns right away
+task_queue = queue.Queue()
+
+
+def submit_pending(pending: dict) -> dict:
+    """Queue a pending tender for extraction unless an upload with the same
+    content already covers it: a finished one is aliased right away, one
+    still processing gets pending added to its waiting duplicates.
+    Returns the tender to store. Callers must hold tenders_lock.
+    """
+    if 'digest' not in pending:
+        # Queued before uploads were hashed; nothing to compare against
+        task_queue.put(pending)
+        return pending
+    key = dedup_key(pending)
+    original = tenders.get(_hash_index.get(key))
+    if original is None:
+        _hash_index[key] = pending['id']
+        task_queue.put(pending)
+        return pending
+    if original['status'] == 'processing':
+        _waiting_duplicates.setdefault(original['id'], []).append(pending)
+        return pending
+    return alias_tender(original, pending)
+
+
+def process_worker() -> None:
+    """Take pending tenders off task_queue, process them and store the result,
+    along with any duplicate uploads that were waiting for it.
+    """
+    while True:
+        pending = task_queue.get()
+        try:
+            tender = process_file(pending)
+        except Exception as e:
+            print(f"Processing failed for {pending['path']}: {e}")
+            tender = dict(pending, status='failed')
+        with tenders_lock:
+            tenders[tender['id']] = tender
+            finished = [tender]
+            duplicates = _waiting_duplicates.pop(tender['id'], [])
+            if is_reusable(tender):
+                finished.extend(alias_tender(tender, dup) for dup in duplicates)
+            else:
+                # Let the next copy try again instead of copying the failure
+                # or an empty extraction
+                if 'digest' in tender and _hash_index.get(dedup_key(tender)) == tender['id']:
+                    del _hash_index[dedup_key(tender)]
+                for dup in duplicates:
+                    submit_pending(dup)
+            for done in finished[1:]:
+                tenders[done['id']] = done
+            schedule_save(finished)
+            _index_cache['version'] += 1
+        task_queue.task_done()
+
+
+for _ in range(MAX_WORKERS):
+    threading.Thread(target=process_worker, daemon=True).start()
+
+# Requeue uploads that were still processing when the server last stopped
+with tenders_lock:
+    for _tender in list(tenders.values()):
+        if _tender.get('status') == 'processing':
+            _tender = submit_pending(_tender)
+            tenders[_tender['id']] = _tender
+
+
 # Inline HTML templates with embedded CSS. The {{ rows_html }} and other variables
-# are inserted via render_template_string.
+# are inserted when the compiled templates below are rendered.
 INDEX_TEMPLATE = """
 <!DOCTYPE html>
 <html lang="en">
@@ -217,6 +658,14 @@ INDEX_TEMPLATE = """
     }
     .upload-section button:hover { background-color: #1e40af; }
     .hint { font-size: 0.8rem; color: #6b7280; }
+    .badge {
+        padding: 0.1rem 0.5rem;
+        border-radius: 9999px;
+        font-size: 0.8rem;
+        background-color: #fef3c7;
+        color: #92400e;
+    }
+    .badge.failed { background-color: #fee2e2; color: #991b1b; }
     footer {
         text-align: center;
         padding: 1rem 0;
@@ -338,6 +787,7 @@ DETAIL_TEMPLATE = """
     <main>
         <h2>{{ filename }}</h2>
         <p><strong>Uploaded At:</strong> {{ uploaded_at }}</p>
+        {% if status != 'done' %}<p><strong>Status:</strong> {{ status }}</p>{% endif %}
         <p><strong>EMD:</strong> {{ emd }}</p>
         <p><strong>Due Date:</strong> {{ due_date }}</p>
         <p><strong>Eligibility (excerpt):</strong> {{ eligibility }}</p>
@@ -346,6 +796,7 @@ DETAIL_TEMPLATE = """
         {{ table_html | safe }}
         <h3>Full Text</h3>
         <pre class="text-block">{{ full_text }}</pre>
+        {% if more_url %}<p><a href="{{ more_url }}">Show the rest of the text</a></p>{% endif %}
     </main>
     <footer>
         <p>&copy; {{ year }} TenderAI</p>
@@ -355,22 +806,37 @@ DETAIL_TEMPLATE = """
 """
 
 
+# Compile both templates once through the app environment, which keeps
+# autoescaping and the Flask globals; render_template_string recompiles per call.
+INDEX_T = app.jinja_env.from_string(INDEX_TEMPLATE)
+DETAIL_T = app.jinja_env.from_string(DETAIL_TEMPLATE)
+
+
 @app.route('/')
 def index():
     """Render the dashboard with a list of uploaded tenders."""
-    tender_list = sorted(tenders.values(), key=lambda x: x['uploaded_at'], reverse=True)
-    rows_html = ''
-    for i, tender in enumerate(tender_list, 1):
-        summary = tender['summary'] or 'No summary'
-        emd = tender['emd'] or '—'
-        due = tender['due_date'] or '—'
-        rows_html += (
-            f"<tr><td>{i}</td><td>{tender['filename']}</td>"
-            f"<td>{emd}</td><td>{due}</td><td>{summary}</td>"
-            f"<td><a href='/tender/{tender['id']}'>View</a> | "
-            f"<a href='/download/{tender['id']}'>Download</a></td></tr>"
-        )
-    return render_template_string(INDEX_TEMPLATE, rows_html=rows_html, year=datetime.utcnow().year)
+    with tenders_lock:
+        if _index_cache['built_version'] != _index_cache['version']:
+            tender_list = sorted(tenders.values(), key=itemgetter('uploaded_at_ts'), reverse=True)
+            parts = []
+            for i, tender in enumerate(tender_list, 1):
+                status = tender.get('status', 'done')
+                if status == 'done':
+                    summary = escape(tender['summary'] or 'No summary')
+                else:
+                    summary = f"<span class='badge {status}'>{status.capitalize()}</span>"
+                emd = escape(tender['emd'] or '—')
+                due = escape(tender['due_date'] or '—')
+                parts.append(
+                    f"<tr><td>{i}</td><td>{escape(tender['filename'])}</td>"
+                    f"<td>{emd}</td><td>{due}</td><td>{summary}</td>"
+                    f"<td><a href='/tender/{tender['id']}'>View</a> | "
+                    f"<a href='/download/{tender['id']}'>Download</a></td></tr>"
+                )
+            _index_cache['rows_html'] = ''.join(parts)
+            _index_cache['built_version'] = _index_cache['version']
+        rows_html = _index_cache['rows_html']
+    return INDEX_T.render(rows_html=rows_html, year=datetime.utcnow().year)
 
 
 @app.route('/upload', methods=['POST'])
@@ -383,8 +849,16 @@ def upload():
     if not files or files[0].filename == '':
         flash('No files selected')
         return redirect(url_for('index'))
-    for f in files:
-        process_file(f)
+    # Save in the request thread; FileStorage streams are not safe to share
+    pending = [save_upload(f) for f in files]
+    # One queued write per request, not per file. Extraction runs on the
+    # worker threads, and repeated content is resolved from the first copy.
+    with tenders_lock:
+        for i, tender in enumerate(pending):
+            tender = pending[i] = submit_pending(tender)
+            tenders[tender['id']] = tender
+        schedule_save(pending)
+        _index_cache['version'] += 1
     flash(f"Uploaded {len(files)} file(s) successfully!")
     return redirect(url_for('index'))
 
@@ -399,25 +873,46 @@ def tender_detail(tid):
     # Build table HTML for XLSX rows if available
     table_html = ''
     if tender.get('table_rows'):
-        table_html += '<h3>Table Data (first 10 rows)</h3><table><tbody>'
-        for row in tender['table_rows'][:10]:
-            cells = ''.join(f"<td>{c}</td>" for c in row[:10])
-            table_html += f"<tr>{cells}</tr>"
-        table_html += '</tbody></table>'
-    return render_template_string(
-        DETAIL_TEMPLATE,
+        parts = [f'<h3>Table Data (first {TABLE_PREVIEW_ROWS} rows)</h3><table><tbody>']
+        for row in tender['table_rows'][:TABLE_PREVIEW_ROWS]:
+            cells = ''.join(f"<td>{escape(c)}</td>" for c in row[:10])
+            parts.append(f"<tr>{cells}</tr>")
+        parts.append('</tbody></table>')
+        table_html = ''.join(parts)
+    # Inline only a preview of the text; the rest is streamed by tender_text
+    full_text = read_tender_text(tender, limit=TEXT_CHUNK_CHARS + 1)
+    more_url = None
+    if len(full_text) > TEXT_CHUNK_CHARS:
+        full_text = full_text[:TEXT_CHUNK_CHARS] + '\n\n… (truncated)'
+        more_url = url_for('tender_text', tid=tid, offset=TEXT_CHUNK_CHARS)
+    return DETAIL_T.render(
         filename=tender['filename'],
         uploaded_at=tender['uploaded_at'],
+        status=tender.get('status', 'done'),
         emd=tender['emd'] or '—',
         due_date=tender['due_date'] or '—',
         eligibility=tender['eligibility'] or '—',
         summary=tender['summary'] or 'No summary available for this tender.',
-        full_text=tender['text'],
+        full_text=full_text,
+        more_url=more_url,
         table_html=table_html,
         year=datetime.utcnow().year
     )
 
 
+@app.route('/tender/<tid>/text')
+def tender_text(tid):
+    """Serve a tender's extracted text from offset to the end as plain text,
+    streamed in chunks so the whole text is never held in memory.
+    """
+    tender = tenders.get(tid)
+    if not tender:
+        flash('Tender not found')
+        return redirect(url_for('index'))
+    offset = max(request.args.get('offset', 0, type=int), 0)
+    return Response(iter_tender_text(tender, offset), mimetype='text/plain')
+
+
 @app.route('/download/<tid>')
 def download(tid):
     """Serve the original uploaded file for download."""
@@ -427,9 +922,17 @@ def download(tid):
         return redirect(url_for('index'))
     directory = os.path.dirname(tender['path'])
     filename = os.path.basename(tender['path'])
-    return send_from_directory(directory, filename, as_attachment=True)
+    # Stored uploads never change, so the tender id is a strong ETag and
+    # browsers may cache the file for good; repeats become 304s
+    response = send_from_directory(directory, filename, as_attachment=True,
+                                   etag=tender['id'], max_age=31536000)
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
 
 
 if __name__ == '__main__':
+    # Hosting platforms stop the app with SIGTERM; flush queued tenders first
+    signal.signal(signal.SIGTERM, exit_on_sigterm)
     # Run the app on all interfaces to accommodate hosting platforms
     app.run(host='0.0.0.0', port=int(os.environ.get('PORT', 5000)))
\ No newline at end of file